@@ -2,10 +2,15 @@ import asyncio
 import logging
 import os
 import base64
-from urllib.parse import unquote
+import io
+from functools import lru_cache
 
-import boto3
+import orjson
+import pybase64
+import zstandard
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 from mcp.server.fastmcp.server import FastMCP
@@ -25,41 +30,122 @@ logger = logging.getLogger("mcp_s3_server")
 # Create SSE transport with explicit endpoint configuration
 sse_transport = SseServerTransport(endpoint="/sse")
 
-# Create a FastMCP server
-server = FastMCP(
-    name="S3MCPServer",
-    instructions="An MCP server for interacting with S3 storage.",
-    host="0.0.0.0",
-    port=9999,
+# A custom endpoint is usually MinIO over plain HTTP or a self-signed
+# certificate, so certificate verification is off by default for it.
+# AWS itself is always reached over verified HTTPS.
+s3_endpoint_url = os.getenv("S3_ENDPOINT_URL", None)
+verify_ssl = (
+    os.getenv("S3_VERIFY_SSL", "false" if s3_endpoint_url else "true").lower() == "true"
 )
 
-# Initialize S3 resource
-max_buckets = int(os.getenv("S3_MAX_BUCKETS", "5"))
-s3_resource = S3Resource(
-    region_name=os.getenv("AWS_REGION", "us-east-1"),
-    max_buckets=max_buckets,
-    endpoint_url=os.getenv("S3_ENDPOINT_URL", None),
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", None),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", None),
+# Upload bodies are SHA-256 signed unless they travel over verified HTTPS,
+# where TLS already protects the payload and requests carry UNSIGNED-PAYLOAD
+sign_payload = not (
+    verify_ssl and (s3_endpoint_url or "https://").startswith("https://")
 )
 
-# Configure boto3 client for S3/MinIO
+# Configure the S3 client for S3/MinIO
 minio_config = Config(
     signature_version="s3v4",
     region_name=os.getenv("AWS_REGION", "us-east-1"),
-    s3={"addressing_style": "path"},  # Use path-style addressing for MinIO
+    s3={
+        "addressing_style": "path",  # Use path-style addressing for MinIO
+        "payload_signing_enabled": sign_payload,
+    },
+    max_pool_connections=64,  # Concurrent tool calls share one keep-alive pool
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    tcp_keepalive=True,
+    # Only compute/validate CRC checksums when an operation requires them
+    request_checksum_calculation="when_required",
+    response_checksum_validation="when_required",
+    disable_request_compression=True,
 )
 
-boto3_s3_client = boto3.client(
-    "s3",
-    endpoint_url=os.getenv("S3_ENDPOINT_URL", None),
+# Initialize S3 resource, its client is shared by the resource handler and
+# every tool below
+max_buckets = int(os.getenv("S3_MAX_BUCKETS", "5"))
+s3_resource = S3Resource(
+    region_name=os.getenv("AWS_REGION", "us-east-1"),
+    max_buckets=max_buckets,
+    endpoint_url=s3_endpoint_url,
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID", None),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY", None),
     config=minio_config,
-    verify=False,  # Disable SSL verification for MinIO
-    use_ssl=False,  # Disable SSL for MinIO
+    verify=verify_ssl,
+)
+
+# Pooled connections opened at startup, and how often they are pinged so
+# idle keep-alive sockets are not dropped
+WARM_CONNECTIONS = min(minio_config.max_pool_connections, 16)
+KEEPALIVE_INTERVAL = 4 * 60
+
+
+async def _keep_connections_warm() -> None:
+    """Open WARM_CONNECTIONS pooled connections, then keep them alive"""
+    s3 = await s3_resource.get_client()
+
+    async def ping() -> None:
+        try:
+            await s3.list_buckets()
+        except Exception as e:
+            logger.debug(f"Connection keep-alive request failed: {str(e)}")
+
+    while True:
+        # Concurrent requests force the pool to hold that many sockets
+        await asyncio.gather(*(ping() for _ in range(WARM_CONNECTIONS)))
+        await asyncio.sleep(KEEPALIVE_INTERVAL)
+
+
+# Create a FastMCP server
+server = FastMCP(
+    name="S3MCPServer",
+    instructions="An MCP server for interacting with S3 storage.",
+    host="0.0.0.0",
+    port=9999,
 )
 
+# Chunk size used when streaming object bodies
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Text objects larger than this are zstd-compressed when the caller asks
+COMPRESS_THRESHOLD = 64 * 1024
+
+# Large uploads are split into parts that are sent concurrently
+transfer_config = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_text_suffix(suffix: str) -> bool:
+    """Cached text/binary decision keyed on the lower-cased key suffix"""
+    return s3_resource.is_text_file("x." + suffix)
+
+
+def is_text_key(key: str) -> bool:
+    """Determine if an object key refers to a text file"""
+    return _is_text_suffix(key.rsplit(".", 1)[-1].lower())
+
+
+def _dump_json(payload: dict) -> str:
+    """
+    Serialize a tool result with orjson, which handles the boto3 datetime
+    fields natively. FastMCP returns str results as-is, skipping its own encoder.
+    """
+    return orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC).decode("utf-8")
+
+
+def _slim_meta(response: dict) -> dict:
+    """Keep only the HTTP status and request id from a boto3 response"""
+    metadata = response.get("ResponseMetadata", {})
+    return {
+        "status": metadata.get("HTTPStatusCode"),
+        "request_id": metadata.get("RequestId"),
+    }
+
 
 # Define S3 resource handlers using FastMCP decorators
 @server.resource(
@@ -67,42 +153,32 @@ boto3_s3_client = boto3.client(
     name="S3 Object",
     description="Access S3 objects using s3://bucket/key format",
 )
-async def get_s3_object(bucket: str, key: str) -> str:
+async def get_s3_object(bucket: str, key: str) -> str | bytes:
     """Read content from an S3 resource and return it"""
     logger.debug(f"Reading S3 object - Bucket: {bucket}, Key: {key}")
 
     try:
-        response = await s3_resource.get_object(bucket, key)
+        response = await s3_resource.get_object(
+            bucket, key, chunk_size=STREAM_CHUNK_SIZE
+        )
         content_type = response.get("ContentType", "")
         logger.debug(f"Read MIMETYPE response: {content_type}")
+        data = response["Body"]
 
-        # Rest of function remains the same, just replace 'path' with 'key'
-        if "Body" in response:
-            if isinstance(response["Body"], bytes):
-                data = response["Body"]
-            else:
-                # Handle streaming response
-                async with response["Body"] as stream:
-                    data = await stream.read()
-
-            # Process the data based on file type
-            if s3_resource.is_text_file(key):  # Changed from path to key
-                # Return plain text for text files
-                try:
-                    return data.decode("utf-8")
-                except UnicodeDecodeError:
-                    # Fall back to base64 if not valid UTF-8
-                    return base64.b64encode(data).decode("utf-8")
-            else:
-                # Return base64 encoded data for binary files
-                return base64.b64encode(data).decode("utf-8")
-        else:
-            raise ValueError("No data in response body")
+        # Process the data based on file type
+        if is_text_key(key):
+            try:
+                return data.decode("utf-8")
+            except UnicodeDecodeError:
+                # Not valid UTF-8, hand it back as a blob instead
+                pass
+
+        # Raw bytes are returned as BlobResourceContents, FastMCP encodes
+        # them once for the JSON-RPC wire
+        return data
 
     except Exception as e:
-        logger.error(
-            f"Error reading object {key} from bucket {bucket}: {str(e)}"
-        )  # Changed from path to key
+        logger.error(f"Error reading object {key} from bucket {bucket}: {str(e)}")
         raise ValueError(f"Error reading S3 object: {str(e)}")
 
 
@@ -111,11 +187,11 @@ async def get_s3_object(bucket: str, key: str) -> str:
     name="ListBuckets",
     description="List S3 buckets available to the authenticated user",
 )
-async def list_buckets_tool() -> dict:
+async def list_buckets_tool() -> str:
     """List all available S3 buckets"""
     try:
         buckets = await s3_resource.list_buckets(None)
-        return {"buckets": buckets}
+        return _dump_json({"buckets": buckets})
     except Exception as e:
         logger.error(f"Error listing buckets: {str(e)}")
         raise ValueError(f"Failed to list buckets: {str(e)}")
@@ -128,79 +204,127 @@ async def create_bucket_tool(bucket: str, region: str = "") -> dict:
     try:
         # If region not provided or empty, use the default region
         region_name = region or os.getenv("AWS_REGION", "us-east-1")
+        s3 = await s3_resource.get_client()
 
         # For regions other than us-east-1, we need to specify LocationConstraint
         if region_name != "us-east-1":
-            response = boto3_s3_client.create_bucket(
+            response = await s3.create_bucket(
                 Bucket=bucket,
                 CreateBucketConfiguration={"LocationConstraint": region_name},
             )
         else:
-            response = boto3_s3_client.create_bucket(Bucket=bucket)
+            response = await s3.create_bucket(Bucket=bucket)
 
         logger.info(f"Successfully created bucket: {bucket}")
-        return {"status": "success", "bucket": bucket, "response": str(response)}
+        return {"status": "success", "bucket": bucket, "response": _slim_meta(response)}
     except Exception as e:
         logger.error(f"Error creating bucket {bucket}: {str(e)}")
         raise ValueError(f"Failed to create bucket: {str(e)}")
 
 
+# S3 accepts at most 1000 keys per delete_objects request
+DELETE_BATCH_SIZE = 1000
+# Maximum number of delete_objects requests in flight while emptying a bucket
+DELETE_CONCURRENCY = 16
+
+
+async def _empty_bucket(bucket: str) -> bool:
+    """Delete every object and version in a bucket, False if it does not exist"""
+    semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+    tasks = []
+    s3 = await s3_resource.get_client()
+
+    async def delete_batch(objects: list) -> None:
+        try:
+            response = await s3.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": objects, "Quiet": True},  # Only failures
+            )
+        finally:
+            semaphore.release()
+        for error in response.get("Errors", []):
+            logger.warning(
+                f"Failed to delete {error.get('Key')} from bucket {bucket}: "
+                f"{error.get('Message')}"
+            )
+
+    async def submit(objects: list) -> None:
+        # Within a pass, deletes run while the next page is being listed, the
+        # semaphore stops listing from running ahead of the in-flight deletes
+        for i in range(0, len(objects), DELETE_BATCH_SIZE):
+            await semaphore.acquire()
+            tasks.append(
+                asyncio.create_task(delete_batch(objects[i : i + DELETE_BATCH_SIZE]))
+            )
+
+    try:
+        # List and delete all objects. A missing bucket surfaces on the
+        # first page, which saves a separate head_bucket round-trip.
+        paginator = s3.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=bucket, PaginationConfig={"PageSize": 1000})
+        try:
+            async for page in pages:
+                if "Contents" in page:
+                    # Only Key is needed, botocore has already decoded it
+                    await submit([{"Key": obj["Key"]} for obj in page["Contents"]])
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchBucket":
+                return False
+            raise
+
+        # In a versioned bucket each delete above adds a delete marker, so
+        # they must all land before the versions are listed
+        await asyncio.gather(*tasks)
+        tasks.clear()
+
+        # Delete any versioned objects if versioning is enabled
+        paginator = s3.get_paginator("list_object_versions")
+        try:
+            async for page in paginator.paginate(Bucket=bucket):
+                delete_markers = [
+                    {"Key": marker["Key"], "VersionId": marker["VersionId"]}
+                    for marker in page.get("DeleteMarkers", [])
+                ]
+                versions = [
+                    {"Key": version["Key"], "VersionId": version["VersionId"]}
+                    for version in page.get("Versions", [])
+                ]
+
+                if delete_markers or versions:
+                    await submit(delete_markers + versions)
+        except ClientError:
+            # Versioning might not be enabled
+            pass
+
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return True
+
+
 # Tool: Delete Bucket
 @server.tool(name="DeleteBucket", description="Delete an empty S3 bucket")
 async def delete_bucket_tool(bucket: str, force: bool = False) -> dict:
     """Delete an S3 bucket (bucket must be empty unless force=True)"""
     try:
         if force:
-            # Check if bucket exists first
-            try:
-                boto3_s3_client.head_bucket(Bucket=bucket)
-            except:
+            if not await _empty_bucket(bucket):
                 return {
                     "status": "success",
                     "message": f"Bucket {bucket} does not exist",
                 }
 
-            # List and delete all objects
-            paginator = boto3_s3_client.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=bucket):
-                if "Contents" in page:
-                    objects = [{"Key": obj["Key"]} for obj in page["Contents"]]
-                    boto3_s3_client.delete_objects(
-                        Bucket=bucket, Delete={"Objects": objects}
-                    )
-
-            # Delete any versioned objects if versioning is enabled
-            paginator = boto3_s3_client.get_paginator("list_object_versions")
-            try:
-                for page in paginator.paginate(Bucket=bucket):
-                    delete_markers = []
-                    if "DeleteMarkers" in page:
-                        delete_markers = [
-                            {"Key": marker["Key"], "VersionId": marker["VersionId"]}
-                            for marker in page["DeleteMarkers"]
-                        ]
-                    versions = []
-                    if "Versions" in page:
-                        versions = [
-                            {"Key": version["Key"], "VersionId": version["VersionId"]}
-                            for version in page["Versions"]
-                        ]
-
-                    if delete_markers or versions:
-                        boto3_s3_client.delete_objects(
-                            Bucket=bucket, Delete={"Objects": delete_markers + versions}
-                        )
-            except:
-                # Versioning might not be enabled
-                pass
-
         # Now delete the bucket
-        response = boto3_s3_client.delete_bucket(Bucket=bucket)
+        s3 = await s3_resource.get_client()
+        response = await s3.delete_bucket(Bucket=bucket)
         logger.info(f"Successfully deleted bucket: {bucket}")
         return {
             "status": "success",
             "message": f"Bucket {bucket} deleted",
-            "response": str(response),
+            "response": _slim_meta(response),
         }
     except Exception as e:
         logger.error(f"Error deleting bucket {bucket}: {str(e)}")
@@ -212,60 +336,84 @@ async def delete_bucket_tool(bucket: str, force: bool = False) -> dict:
     name="ListObjects",
     description="List objects in an S3 bucket with optional prefix filtering",
 )
-async def list_objects_tool(
-    bucket: str, prefix: str = "", max_keys: int = 1000
-) -> dict:
+async def list_objects_tool(bucket: str, prefix: str = "", max_keys: int = 1000) -> str:
     """List objects in the specified bucket with optional prefix filtering"""
     try:
         objects = await s3_resource.list_objects(
             bucket, prefix=prefix, max_keys=max_keys
         )
-        return {"objects": objects}
+        return _dump_json({"objects": objects})
     except Exception as e:
         logger.error(f"Error listing objects in bucket {bucket}: {str(e)}")
         raise ValueError(f"Failed to list objects: {str(e)}")
 
 
+def _encode_body(data: bytes, text: bool, compress: bool) -> tuple:
+    """
+    Encode an object body as (content, encoding) for the GetObject result.
+    This is CPU-bound on large objects, so callers run it in a worker thread.
+    """
+    if text:
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Not valid UTF-8, return the original bytes as base64 instead
+            return pybase64.b64encode(data).decode("ascii"), "base64"
+        if not (compress and len(data) > COMPRESS_THRESHOLD):
+            return content, "utf-8"
+        # Valid UTF-8, so the client can decode the text after decompression
+        del content
+        compressed = zstandard.ZstdCompressor(level=3, threads=-1).compress(data)
+        return pybase64.b64encode(compressed).decode("ascii"), "zstd+base64"
+    return pybase64.b64encode(data).decode("ascii"), "base64"
+
+
+async def _read_object(bucket: str, key: str, compress: bool = False) -> dict:
+    """Fetch an object and build the GetObject result"""
+    s3 = await s3_resource.get_client()
+    response = await s3.get_object(Bucket=bucket, Key=key)
+    content_type = response.get("ContentType", "application/octet-stream")
+    file_size = response.get("ContentLength", 0)
+    last_modified = (
+        response.get("LastModified", "").isoformat()
+        if response.get("LastModified")
+        else None
+    )
+
+    async with response["Body"] as body:
+        data = await body.read()
+    size = len(data)
+
+    # Decode, compress or base64-encode off the event loop so large objects
+    # do not stall the other sessions
+    content, encoding = await asyncio.to_thread(
+        _encode_body, data, is_text_key(key), compress
+    )
+
+    return {
+        "content_type": content_type,
+        "size_bytes": size,
+        "last_modified": last_modified,
+        "large_file": file_size >= 5 * 1024 * 1024,
+        "content": content,
+        "encoding": encoding,
+    }
+
+
 # Tool: Get Object
 @server.tool(
     name="GetObject",
     description="Retrieve an object from S3 by bucket and key with chunking support for large files",
 )
-async def get_object_tool(bucket: str, key: str) -> dict:
-    """Get an object from S3 by bucket and key"""
-    try:
-        response = boto3_s3_client.get_object(Bucket=bucket, Key=key)
-        content_type = response.get("ContentType", "application/octet-stream")
-        file_size = response.get("ContentLength", 0)
-        last_modified = (
-            response.get("LastModified", "").isoformat()
-            if response.get("LastModified")
-            else None
-        )
-
-        # For all files, we'll now use a single approach
-        data = response["Body"].read()
-        result = {
-            "content_type": content_type,
-            "size_bytes": len(data),
-            "last_modified": last_modified,
-            "large_file": file_size >= 5 * 1024 * 1024,
-        }
-
-        # Process based on file type
-        if s3_resource.is_text_file(key):
-            try:
-                result["content"] = data.decode("utf-8")
-                result["encoding"] = "utf-8"
-            except UnicodeDecodeError:
-                result["content"] = base64.b64encode(data).decode("utf-8")
-                result["encoding"] = "base64"
-        else:
-            result["content"] = base64.b64encode(data).decode("utf-8")
-            result["encoding"] = "base64"
-
-        return result
+async def get_object_tool(bucket: str, key: str, compress: bool = False) -> dict:
+    """
+    Get an object from S3 by bucket and key
 
+    With compress=True, text objects over 64KB are returned zstd-compressed and
+    base64-encoded, with encoding set to "zstd+base64"
+    """
+    try:
+        return await _read_object(bucket, key, compress)
     except Exception as e:
         logger.error(f"Error getting object {key} from bucket {bucket}: {str(e)}")
         raise ValueError(f"Failed to get object: {str(e)}")
@@ -303,12 +451,30 @@ async def put_object_tool(
                 else:
                     content_type = "application/octet-stream"
         else:
-            body = content
+            body = content.encode("utf-8")
 
-        response = boto3_s3_client.put_object(
-            Bucket=bucket, Key=key, Body=body, ContentType=content_type
-        )
-        return {"status": "success", "response": str(response)}
+        s3 = await s3_resource.get_client()
+        if len(body) < transfer_config.multipart_threshold:
+            response = await s3.put_object(
+                Bucket=bucket, Key=key, Body=body, ContentType=content_type
+            )
+        else:
+            await s3.upload_fileobj(
+                io.BytesIO(body),
+                bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=transfer_config,
+            )
+            # A multipart upload spans many requests, so there is no single
+            # status or request id to report
+            response = {}
+        return {
+            "status": "success",
+            "bucket": bucket,
+            "key": key,
+            "response": _slim_meta(response),
+        }
     except Exception as e:
         logger.error(f"Error putting object {key} to bucket {bucket}: {str(e)}")
         raise ValueError(f"Failed to put object: {str(e)}")
@@ -319,16 +485,30 @@ async def put_object_tool(
 async def delete_object_tool(bucket: str, key: str) -> dict:
     """Delete an object from S3"""
     try:
-        response = boto3_s3_client.delete_object(Bucket=bucket, Key=key)
-        return {"status": "success", "response": str(response)}
+        s3 = await s3_resource.get_client()
+        response = await s3.delete_object(Bucket=bucket, Key=key)
+        return {"status": "success", "response": _slim_meta(response)}
     except Exception as e:
         logger.error(f"Error deleting object {key} from bucket {bucket}: {str(e)}")
         raise ValueError(f"Failed to delete object: {str(e)}")
 
 
+async def serve() -> None:
+    """
+    Run the server with the SSE transport, warming the S3 connection pool
+    from startup so the first tool calls reuse open sockets
+    """
+    keepalive = asyncio.create_task(_keep_connections_warm())
+    try:
+        await server.run_sse_async()
+    finally:
+        keepalive.cancel()
+        await asyncio.gather(keepalive, return_exceptions=True)
+        await s3_resource.close()
+
+
 if __name__ == "__main__":
-    # Run the server with the SSE transport
     logger.info(
         f"Starting S3 MCP server on http://{server.settings.host}:{server.settings.port}"
     )
-    server.run(transport="sse")
+    asyncio.run(serve())
@@ -1,5 +1,7 @@
+import io
 import logging
 import os
+from contextlib import AsyncExitStack
 from typing import List, Dict, Any, Optional
 import aioboto3
 import asyncio
@@ -22,6 +24,9 @@ class S3Resource:
         endpoint_url: str = None,
         aws_access_key_id: str = None,
         aws_secret_access_key: str = None,
+        config: Optional[Config] = None,
+        verify: Optional[bool] = None,
+        use_ssl: bool = True,
     ):
         """
         Initialize S3 resource provider
@@ -32,6 +37,9 @@ class S3Resource:
             endpoint_url: Optional endpoint URL for S3 (for localstack or other services)
             aws_access_key_id: Optional AWS access key ID
             aws_secret_access_key: Optional AWS secret access key
+            config: Optional botocore Config merged over the defaults below
+            verify: Optional SSL certificate verification setting
+            use_ssl: Whether to use SSL when no endpoint URL is given
         """
         # Configure boto3 with retries and timeouts
         self.config = Config(
@@ -42,6 +50,8 @@ class S3Resource:
             signature_version="s3v4",
             region_name=region_name,
         )
+        if config is not None:
+            self.config = self.config.merge(config)
 
         self.session = aioboto3.Session()
         self.region_name = region_name
@@ -50,6 +60,41 @@ class S3Resource:
         self.endpoint_url = endpoint_url
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
+        self.verify = verify
+        self.use_ssl = use_ssl
+
+        # One client, and so one connection pool, is shared by every caller
+        self._client = None
+        self._client_stack = AsyncExitStack()
+        self._client_lock = asyncio.Lock()
+
+    async def get_client(self):
+        """
+        Get the shared async S3 client, creating it on first use.
+        The client stays open for the lifetime of the provider.
+        """
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = await self._client_stack.enter_async_context(
+                        self.session.client(
+                            "s3",
+                            region_name=self.region_name,
+                            endpoint_url=self.endpoint_url,
+                            aws_access_key_id=self.aws_access_key_id,
+                            aws_secret_access_key=self.aws_secret_access_key,
+                            config=self.config,
+                            verify=self.verify,
+                            use_ssl=self.use_ssl,
+                        )
+                    )
+        return self._client
+
+    async def close(self):
+        """Close the shared S3 client and its pooled connections"""
+        async with self._client_lock:
+            await self._client_stack.aclose()
+            self._client = None
 
     def _get_configured_buckets(self) -> List[str]:
         """
@@ -81,40 +126,33 @@ class S3Resource:
         """
         List S3 buckets using async client with pagination
         """
-        async with self.session.client(
-            "s3",
-            region_name=self.region_name,
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            config=self.config,
-        ) as s3:
-            if self.configured_buckets:
-                # If buckets are configured, only return those
-                response = await s3.list_buckets()
-                all_buckets = response.get("Buckets", [])
+        s3 = await self.get_client()
+        if self.configured_buckets:
+            # If buckets are configured, only return those
+            response = await s3.list_buckets()
+            all_buckets = response.get("Buckets", [])
+            configured_bucket_list = [
+                bucket
+                for bucket in all_buckets
+                if bucket["Name"] in self.configured_buckets
+            ]
+
+            #
+            if start_after:
                 configured_bucket_list = [
-                    bucket
-                    for bucket in all_buckets
-                    if bucket["Name"] in self.configured_buckets
+                    b for b in configured_bucket_list if b["Name"] > start_after
                 ]
 
-                #
-                if start_after:
-                    configured_bucket_list = [
-                        b for b in configured_bucket_list if b["Name"] > start_after
-                    ]
+            return configured_bucket_list[: self.max_buckets]
+        else:
+            # Default behavior if no buckets configured
+            response = await s3.list_buckets()
+            buckets = response.get("Buckets", [])
 
-                return configured_bucket_list[: self.max_buckets]
-            else:
-                # Default behavior if no buckets configured
-                response = await s3.list_buckets()
-                buckets = response.get("Buckets", [])
+            if start_after:
+                buckets = [b for b in buckets if b["Name"] > start_after]
 
-                if start_after:
-                    buckets = [b for b in buckets if b["Name"] > start_after]
-
-                return buckets[: self.max_buckets]
+            return buckets[: self.max_buckets]
 
     async def list_objects(
         self, bucket_name: str, prefix: str = "", max_keys: int = 1000
@@ -131,58 +169,54 @@ class S3Resource:
             logger.warning(f"Bucket {bucket_name} not in configured bucket list")
             return []
 
-        async with self.session.client(
-            "s3",
-            region_name=self.region_name,
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            config=self.config,
-        ) as s3:
-            response = await s3.list_objects_v2(
-                Bucket=bucket_name, Prefix=prefix, MaxKeys=max_keys
-            )
-            return response.get("Contents", [])
+        s3 = await self.get_client()
+        response = await s3.list_objects_v2(
+            Bucket=bucket_name, Prefix=prefix, MaxKeys=max_keys
+        )
+        return response.get("Contents", [])
 
     async def get_object(
-        self, bucket_name: str, key: str, max_retries: int = 3
+        self,
+        bucket_name: str,
+        key: str,
+        max_retries: int = 3,
+        chunk_size: int = 69 * 1024,
     ) -> Dict[str, Any]:
         """
         Get object from S3 using streaming to handle large files and PDFs reliably.
-        The method reads the stream in chunks and concatenates them before returning.
+        The method reads the stream in chunks into one buffer presized from
+        ContentLength and returns it as the Body bytes without a final copy.
         """
         if self.configured_buckets and bucket_name not in self.configured_buckets:
             raise ValueError(f"Bucket {bucket_name} not in configured bucket list")
 
         attempt = 0
         last_exception = None
-        chunk_size = (
-            69 * 1024
-        )  # Using same chunk size as example for proven performance
 
         while attempt < max_retries:
             try:
-                async with self.session.client(
-                    "s3",
-                    region_name=self.region_name,
-                    endpoint_url=self.endpoint_url,
-                    aws_access_key_id=self.aws_access_key_id,
-                    aws_secret_access_key=self.aws_secret_access_key,
-                    config=self.config,
-                ) as s3:
-
-                    # Get the object and its stream
-                    response = await s3.get_object(Bucket=bucket_name, Key=key)
-                    stream = response["Body"]
-
-                    # Read the entire stream in chunks
-                    chunks = []
-                    async for chunk in stream:
-                        chunks.append(chunk)
-
-                    # Replace the stream with the complete data
-                    response["Body"] = b"".join(chunks)
-                    return response
+                s3 = await self.get_client()
+
+                # Get the object and its stream
+                response = await s3.get_object(Bucket=bucket_name, Key=key)
+
+                # Fill one buffer instead of joining chunks. BytesIO grows if the
+                # body is longer than ContentLength, and getvalue() hands back its
+                # buffer as bytes without copying it.
+                buffer = io.BytesIO()
+                length = int(response.get("ContentLength") or 0)
+                if length:
+                    buffer.seek(length - 1)
+                    buffer.write(b"\0")
+                    buffer.seek(0)
+                async with response["Body"] as stream:
+                    async for chunk in stream.iter_chunks(chunk_size):
+                        buffer.write(chunk)
+                buffer.truncate(buffer.tell())
+
+                # Replace the stream with the complete data
+                response["Body"] = buffer.getvalue()
+                return response
 
             except Exception as e:
                 last_exception = e
@@ -1,8 +1,24 @@
+import argparse
 import asyncio
-import base64
+import io
+import json
 import logging
+import os
+import sys
+import time
+from contextlib import AsyncExitStack
+
+import aiofiles
+import anyio
+import httpx
+import pybase64
+import zstandard
 from mcp import ClientSession
 from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import WordCompleter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -10,296 +26,775 @@ logger = logging.getLogger("mcp-s3-client")
 
 SERVER_URL = "http://localhost:30999/sse"  # Change this to your server URL
 
-
-async def main():
-    # Connect to the remote server via SSE
-    logger.info(f"Connecting to S3 MCP server at {SERVER_URL}")
-
-    async with sse_client(SERVER_URL) as (read_stream, write_stream):
-        async with ClientSession(read_stream, write_stream) as session:
-            # Initialize the connection
-            await session.initialize()
-            logger.info("Connection initialized")
-
-            # List available tools
+# Content types inferred from the upload file extension
+EXT_MIME = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+# Maximum number of tool calls in flight in batch mode
+BATCH_CONCURRENCY = 32
+
+# Tools offered by the S3 MCP server, accepted as "op" in batch files
+TOOL_NAMES = {
+    "ListBuckets",
+    "CreateBucket",
+    "DeleteBucket",
+    "ListObjects",
+    "GetObject",
+    "PutObject",
+    "DeleteObject",
+}
+
+# Number of characters of object content previewed by Get Object
+PREVIEW_LIMIT = 1000
+
+# ListObjects results are reused for this many seconds, keyed by
+# (bucket, prefix, max_keys). Creating a bucket, uploads and deletes drop
+# a bucket's entries.
+LIST_CACHE_TTL = 30
+_list_cache = {}
+
+# Print listings and batch results as one line of JSON (--json)
+JSON_OUTPUT = False
+
+# Names seen in earlier listings, offered as completions at the prompts
+_bucket_names = set()
+_object_keys = set()
+BUCKET_COMPLETER = WordCompleter(lambda: sorted(_bucket_names), sentence=True)
+KEY_COMPLETER = WordCompleter(lambda: sorted(_object_keys), sentence=True)
+
+# Prompt with in-memory history, created on first use, see ainput()
+_prompt_session = None
+
+# Shared client session. anyio requires the SSE connection to be opened and
+# closed by the same task, so _run_session() owns it and other tasks only
+# signal that task, see get_session() and reopen_session().
+_session = None
+_session_task = None
+_session_ready = None  # Future resolved with the next usable session
+_session_broken = asyncio.Event()
+
+# Errors that mean the SSE connection dropped, see safe_call()
+CONNECTION_ERRORS = (
+    ConnectionError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    httpx.TransportError,
+)
+
+# Read uploads in blocks that are a multiple of 3 so base64 stays aligned
+UPLOAD_BLOCK_SIZE = 3 * 1024 * 1024
+
+
+async def encode_file_base64(file_path):
+    """
+    Base64-encode a file block by block instead of reading it all at once.
+    Reads go through aiofiles so other MCP calls keep running meanwhile.
+    """
+    # Whole file-system blocks per read, in a multiple of 3 bytes
+    fs_block = 3 * os.stat(file_path).st_blksize
+    block_size = fs_block * max(1, UPLOAD_BLOCK_SIZE // fs_block)
+
+    encoded = io.BytesIO()
+    async with aiofiles.open(file_path, "rb") as file:
+        while block := await file.read(block_size):
+            encoded.write(pybase64.b64encode(block))
+    return encoded.getvalue().decode("ascii")
+
+
+def normalize_tool(tool):
+    """Get (name, description) from any of the tool formats a server may return"""
+    name = getattr(tool, "name", None)
+    if name is not None:
+        return name, getattr(tool, "description", None)
+    if type(tool) is dict:
+        return tool.get("name"), tool.get("description", "")
+    if type(tool) is tuple and len(tool) >= 2:
+        return tool[0], tool[1]
+    return str(tool), ""
+
+
+def extract_content(result):
+    """
+    Get a tool result as a dict when it carries one, either directly or as
+    JSON text in its first content part. Other results are returned unchanged.
+    """
+    if type(result) is dict:
+        return result
+    parts = getattr(result, "content", None)
+    if parts:
+        text = getattr(parts[0], "text", None)
+        if text is not None:
             try:
-                logger.info("Retrieving available tools...")
-                # Get list of available tools
-                tools = await session.list_tools()
-
-                if tools:
-                    print("\nAvailable Tools:")
-                    for tool in tools:
-                        # Handle different possible formats of tool information
-                        if hasattr(tool, "name") and hasattr(tool, "description"):
-                            # Object with attributes
-                            print(f"- {tool.name}: {tool.description}")
-                        elif isinstance(tool, tuple) and len(tool) >= 2:
-                            # Tuple with name and description
-                            print(f"- {tool[0]}: {tool[1]}")
-                        elif isinstance(tool, dict) and "name" in tool:
-                            # Dictionary with name key
-                            print(f"- {tool['name']}: {tool.get('description', '')}")
-                        else:
-                            # Just print the tool as is
-                            print(f"- {tool}")
-                else:
-                    print("\nNo tools available from server")
-            except Exception as e:
-                print(f"Error retrieving tools: {e}")
-                # Continue anyway since we know the tools we want to use
-                print("\nContinuing with known operations...")
-
-            # Main menu for operations
-            while True:
-                print("\n=== S3 Operations Menu ===")
-                print("1. List Buckets")
-                print("2. Create Bucket")
-                print("3. Delete Bucket")
-                print("4. List Objects in Bucket")
-                print("5. Get Object")
-                print("6. Upload Object")
-                print("7. Delete Object")
-                print("8. Exit")
-
-                choice = input("\nSelect an operation (1-8): ")
-
-                if choice == "1":
-                    # List available buckets
-                    logger.info("Listing buckets...")
-                    buckets_result = await session.call_tool("ListBuckets")
-
-                    if isinstance(buckets_result, dict) and "buckets" in buckets_result:
-                        buckets = buckets_result["buckets"]
-                        print("\nAvailable Buckets:")
-                        for bucket in buckets:
-                            if isinstance(bucket, dict) and "Name" in bucket:
-                                print(f"- {bucket['Name']}")
-                    else:
-                        print(f"\nBuckets response: {buckets_result}")
-
-                elif choice == "2":
-                    # Create a new bucket
-                    bucket_name = input("Enter name for new bucket: ")
-                    region = input("Enter region (leave blank for default): ")
-
-                    logger.info(f"Creating bucket: {bucket_name}")
+                data = json.loads(text)
+            except ValueError:
+                return result
+            if type(data) is dict:
+                return data
+    return result
+
+
+def head_join(parts, limit=PREVIEW_LIMIT):
+    """
+    Join parts with newlines for a preview of at most limit characters.
+    Stops reading parts once the limit is passed and marks truncation with "...".
+    """
+    buf = []
+    length = -1  # No separator before the first part
+    for part in parts:
+        text = str(part)
+        buf.append(text)
+        length += len(text) + 1
+        if length > limit:
+            break
+    out = "\n".join(buf)
+    return out[:limit] + "..." if len(out) > limit else out
+
+
+def write_json(data):
+    """Write data to stdout as compact JSON in a single write"""
+    sys.stdout.write(json.dumps(data, separators=(",", ":"), default=str) + "\n")
+
+
+def result_json(result):
+    """Get a tool result, or the exception that replaced it, in JSON-ready form"""
+    if isinstance(result, BaseException):
+        return {"error": str(result)}
+    data = extract_content(result)
+    if isinstance(data, dict):
+        return data
+    dump = getattr(result, "model_dump", None)
+    return dump(mode="json") if dump else str(result)
+
+
+def invalidate_list_cache(bucket):
+    """Drop cached ListObjects results for a bucket after it changes"""
+    for cache_key in [k for k in _list_cache if k[0] == bucket]:
+        del _list_cache[cache_key]
+
+
+async def _run_session():
+    """
+    Own the shared SSE connection: open it, publish the session through
+    _session_ready, and reconnect whenever reopen_session() reports it broken.
+    Runs until close_session() cancels it.
+    """
+    global _session, _session_ready
+    while True:
+        connected = False
+        try:
+            async with AsyncExitStack() as stack:
+                read_stream, write_stream = await stack.enter_async_context(
+                    sse_client(SERVER_URL)
+                )
+                session = await stack.enter_async_context(
+                    ClientSession(read_stream, write_stream)
+                )
+                await session.initialize()
+                connected = True
+                _session = session
+                _session_ready.set_result(session)
+                await _session_broken.wait()
+        except Exception as e:
+            if not connected:
+                # Hand the connection error to the waiting callers
+                _session_ready.set_exception(e)
+                return
+            # The old connection is already broken, so failing to close it is expected
+            logger.debug("Error closing session: %s", e)
+        _session_broken.clear()
+        if _session_ready.done():
+            # The connection ended without a reopen_session() call
+            _session = None
+            _session_ready = asyncio.get_running_loop().create_future()
+
+
+async def get_session():
+    """
+    Get the shared ClientSession, connecting and initializing it on first use.
+    Every operation reuses the same SSE connection until close_session() is called.
+    """
+    global _session_task, _session_ready
+    if _session_task is None or _session_task.done():
+        _session_ready = asyncio.get_running_loop().create_future()
+        _session_task = asyncio.create_task(_run_session())
+    # Shielded so a cancelled caller does not cancel the other waiters
+    return await asyncio.shield(_session_ready)
+
+
+async def close_session():
+    """Close the shared ClientSession and its SSE connection"""
+    global _session, _session_task
+    task, _session_task = _session_task, None
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if not _session_ready.done():
+            # Closed while connecting, release the callers still waiting
+            _session_ready.cancel()
+    _session = None
+
+
+def reopen_session(stale):
+    """
+    Ask the session task to replace a broken session with a new connection.
+    Concurrent callers that saw the same session fail only reconnect once.
+    """
+    global _session, _session_ready
+    if _session is stale and _session_task is not None:
+        _session = None
+        _session_ready = asyncio.get_running_loop().create_future()
+        _session_broken.set()
+
+
+def connection_lost(error):
+    """
+    Whether a request failed because the SSE connection dropped.
+    Slow requests are never treated as lost, since retrying them would run
+    work that may still be in progress on the server a second time.
+    """
+    if isinstance(error, McpError):
+        # Pending requests fail with CONNECTION_CLOSED when the stream ends
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, CONNECTION_ERRORS)
+
+
+async def safe_request(send, retries=2):
+    """
+    Run send(session) on the shared session, reconnecting and retrying up to
+    retries times if the SSE connection has dropped.
+    """
+    for attempt in range(retries + 1):
+        session = await get_session()
+        try:
+            return await send(session)
+        except Exception as e:
+            if attempt == retries or not connection_lost(e):
+                raise
+            logger.warning("Connection lost (%s), reconnecting...", e)
+            reopen_session(session)
+
+
+async def safe_call(name, arguments=None, retries=2):
+    """Call a tool, reconnecting if the SSE connection has dropped"""
+    return await safe_request(
+        lambda session: session.call_tool(name, arguments), retries
+    )
+
+
+async def ainput(prompt, completer=None):
+    """
+    Read a line without blocking the event loop.
+    Earlier answers are kept in the prompt history, and completer offers
+    names from earlier listings.
+    """
+    global _prompt_session
+    if _prompt_session is None:
+        _prompt_session = PromptSession()
+    return await _prompt_session.prompt_async(prompt, completer=completer)
+
+
+async def batch_call(calls):
+    """
+    Run (tool name, arguments) pairs concurrently over the shared session, with
+    at most BATCH_CONCURRENCY calls in flight. Failed calls return their exception.
+    arguments may also be an async function that builds them once the call runs,
+    so large arguments are only held for the calls in flight.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def call(name, arguments):
+        async with semaphore:
+            if callable(arguments):
+                arguments = await arguments()
+            return await safe_call(name, arguments)
+
+    return await asyncio.gather(
+        *(call(name, arguments) for name, arguments in calls), return_exceptions=True
+    )
+
+
+def load_batch(batch_path):
+    """
+    Read a batch file and check every entry before anything is sent.
+    Raises ValueError naming the index of the first invalid entry.
+    """
+    with open(batch_path, "r", encoding="utf-8") as f:
+        batch = json.load(f)
+
+    if not isinstance(batch, list):
+        raise ValueError("expected a JSON list of operations")
+    for index, op in enumerate(batch):
+        if not isinstance(op, dict) or not isinstance(op.get("op"), str):
+            raise ValueError(f'entry {index} has no "op" tool name')
+        if op["op"] not in TOOL_NAMES:
+            raise ValueError(f"entry {index} has unknown op {op['op']!r}")
+    return batch
+
+
+async def run_batch(batch_path):
+    """
+    Run a JSON list of tool calls concurrently over a single session.
+    Each entry names the tool in "op", the remaining keys are its arguments:
+    [{"op": "GetObject", "bucket": "my-bucket", "key": "file.txt"}, ...]
+    Returns the process exit code, 2 if the batch file is invalid.
+    """
+    try:
+        batch = load_batch(batch_path)
+    except (OSError, ValueError) as e:
+        print(f"Invalid batch file {batch_path}: {e}", file=sys.stderr)
+        return 2
+
+    logger.info("Running %s operations against %s", len(batch), SERVER_URL)
+
+    await get_session()
+    try:
+        results = await batch_call(
+            [(op["op"], {k: v for k, v in op.items() if k != "op"}) for op in batch],
+        )
+    finally:
+        await close_session()
+
+    if JSON_OUTPUT:
+        write_json(
+            [
+                {"op": op["op"], "result": result_json(result)}
+                for op, result in zip(batch, results)
+            ]
+        )
+        return 0
+
+    for op, result in zip(batch, results):
+        print(f"{op['op']}: {result}")
+    return 0
+
+
+async def show_tools():
+    """List the tools offered by the server"""
+    try:
+        logger.info("Retrieving available tools...")
+        tools = await safe_request(lambda session: session.list_tools())
+
+        if tools:
+            print("\nAvailable Tools:")
+            for name, description in map(
+                normalize_tool, getattr(tools, "tools", tools)
+            ):
+                print(f"- {name}: {description}")
+        else:
+            print("\nNo tools available from server")
+    except Exception as e:
+        print(f"Error retrieving tools: {e}")
+
+
+def remember_buckets(buckets):
+    """Offer the names from a ListBuckets result as bucket completions"""
+    _bucket_names.update(
+        bucket["Name"]
+        for bucket in buckets
+        if isinstance(bucket, dict) and "Name" in bucket
+    )
+
+
+async def prefetch_buckets():
+    """Fill the bucket completions in the background while the menu is shown"""
+    try:
+        result = extract_content(await safe_call("ListBuckets"))
+    except Exception as e:
+        logger.debug("Bucket prefetch failed: %s", e)
+        return
+    if isinstance(result, dict) and "buckets" in result:
+        remember_buckets(result["buckets"])
+
+
+async def list_buckets():
+    """List available buckets"""
+    logger.info("Listing buckets...")
+    buckets_result = extract_content(await safe_call("ListBuckets"))
+
+    if isinstance(buckets_result, dict) and "buckets" in buckets_result:
+        buckets = buckets_result["buckets"]
+        remember_buckets(buckets)
+        if JSON_OUTPUT:
+            write_json(buckets)
+            return
+        # Build the whole listing so it goes out in one write
+        sys.stdout.write(
+            "\nAvailable Buckets:\n"
+            + "".join(
+                f"- {bucket['Name']}\n"
+                for bucket in buckets
+                if isinstance(bucket, dict) and "Name" in bucket
+            )
+        )
+    else:
+        print(f"\nBuckets response: {buckets_result}")
+
+
+async def create_bucket():
+    """Create a new bucket"""
+    bucket_name = await ainput("Enter name for new bucket: ")
+    region = await ainput("Enter region (leave blank for default): ")
+
+    logger.info("Creating bucket: %s", bucket_name)
+    invalidate_list_cache(bucket_name)
+    try:
+        result = await safe_call(
+            "CreateBucket",
+            {
+                "bucket": bucket_name,
+                "region": region or "",  # Use empty string instead of None
+            },
+        )
+        print(f"\nBucket creation result: {result}")
+    except Exception as e:
+        print(f"Error creating bucket: {e}")
+
+
+async def delete_bucket():
+    """Delete a bucket"""
+    bucket_name = await ainput("Enter bucket name to delete: ", BUCKET_COMPLETER)
+    force = (await ainput("Force deletion of non-empty bucket? (y/n): ")).lower() == "y"
+
+    logger.info("Deleting bucket: %s (force=%s)", bucket_name, force)
+    invalidate_list_cache(bucket_name)
+    try:
+        result = await safe_call(
+            "DeleteBucket", {"bucket": bucket_name, "force": force}
+        )
+        print(f"\nBucket deletion result: {result}")
+    except Exception as e:
+        print(f"Error deleting bucket: {e}")
+
+
+async def list_objects():
+    """List objects in a bucket"""
+    bucket_name = await ainput("Enter bucket name to list objects: ", BUCKET_COMPLETER)
+    prefix = await ainput("Enter prefix filter (optional): ")
+
+    logger.info("Listing objects in bucket %s...", bucket_name)
+    try:
+        cache_key = (bucket_name, prefix, 50)
+        cached = _list_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            objects_result = cached[1]
+        else:
+            objects_result = extract_content(
+                await safe_call(
+                    "ListObjects",
+                    {
+                        "bucket": bucket_name,
+                        "prefix": prefix,
+                        "max_keys": 50,
+                    },
+                )
+            )
+            # Errors are not cached, so the next attempt asks the server again
+            if isinstance(objects_result, dict) and "objects" in objects_result:
+                _list_cache[cache_key] = (time.monotonic(), objects_result)
+
+        if isinstance(objects_result, dict) and "objects" in objects_result:
+            objects = objects_result["objects"]
+            _object_keys.update(
+                obj["Key"] for obj in objects if isinstance(obj, dict) and "Key" in obj
+            )
+            if JSON_OUTPUT:
+                write_json(objects)
+                return
+            sys.stdout.write(
+                f"\nObjects in bucket {bucket_name}:\n"
+                + "".join(
+                    f"- {obj['Key']}\n"
+                    for obj in objects
+                    if isinstance(obj, dict) and "Key" in obj
+                )
+            )
+        else:
+            print(f"\nObjects response: {objects_result}")
+    except Exception as e:
+        print(f"Error listing objects: {e}")
+
+
+async def get_object():
+    """Get object content, optionally saving it to a file"""
+    bucket_name = await ainput("Enter bucket name: ", BUCKET_COMPLETER)
+    object_key = await ainput("Enter object key: ", KEY_COMPLETER)
+
+    # Get the specified object
+    logger.info("Retrieving object %s from bucket %s...", object_key, bucket_name)
+    try:
+        result = extract_content(
+            await safe_call(
+                "GetObject",
+                {
+                    "bucket": bucket_name,
+                    "key": object_key,
+                    "compress": True,
+                },
+            )
+        )
+
+        # Handle the result based on its structure and encoding
+        if isinstance(result, dict):
+            # Display object metadata
+            print(f"\nObject Information:")
+            print(f"Content Type: {result.get('content_type', 'Unknown')}")
+            print(f"Size: {result.get('size_bytes', 'Unknown')} bytes")
+            print(f"Last Modified: {result.get('last_modified', 'Unknown')}")
+
+            # Check encoding type to determine how to handle content
+            encoding = result.get("encoding", "utf-8")
+
+            if encoding == "zstd+base64":
+                # Large text compressed by the server
+                result["content"] = (
+                    zstandard.ZstdDecompressor()
+                    .decompressobj()
+                    .decompress(pybase64.b64decode(result["content"]))
+                    .decode("utf-8", errors="replace")
+                )
+                encoding = "utf-8"
+
+            if encoding == "base64":
+                # Handle binary content (PDF, images, etc.)
+                print(f"\nBinary content detected ({result.get('content_type')})")
+                save_option = await ainput("Save to file? (y/n): ")
+
+                if save_option.lower() == "y":
+                    save_path = await ainput("Enter save path: ")
                     try:
-                        result = await session.call_tool(
-                            "CreateBucket",
-                            {
-                                "bucket": bucket_name,
-                                "region": region
-                                or "",  # Use empty string instead of None
-                            },
+                        binary_data = pybase64.b64decode(
+                            result["content"], validate=False
                         )
-                        print(f"\nBucket creation result: {result}")
+                        with open(save_path, "wb") as f:
+                            f.write(binary_data)
+                        print(f"File saved successfully to {save_path}")
                     except Exception as e:
-                        print(f"Error creating bucket: {e}")
-
-                elif choice == "3":
-                    # Delete a bucket
-                    bucket_name = input("Enter bucket name to delete: ")
-                    force = (
-                        input("Force deletion of non-empty bucket? (y/n): ").lower()
-                        == "y"
-                    )
-
-                    logger.info(f"Deleting bucket: {bucket_name} (force={force})")
+                        print(f"Error saving file: {e}")
+            else:
+                # Handle text content
+                content = result.get("content", "")
+                print(f"\nContent of {object_key}:")
+                print("-----------------------------------")
+                print(head_join([content]))
+                print("-----------------------------------")
+
+                # Optional: Save text content to file
+                save_option = await ainput("Save text to file? (y/n): ")
+                if save_option.lower() == "y":
+                    save_path = await ainput("Enter save path: ")
                     try:
-                        result = await session.call_tool(
-                            "DeleteBucket", {"bucket": bucket_name, "force": force}
-                        )
-                        print(f"\nBucket deletion result: {result}")
+                        with open(save_path, "w", encoding="utf-8") as f:
+                            f.write(content)
+                        print(f"File saved successfully to {save_path}")
                     except Exception as e:
-                        print(f"Error deleting bucket: {e}")
-
-                elif choice == "4":
-                    # List objects in bucket
-                    bucket_name = input("Enter bucket name to list objects: ")
-                    prefix = input("Enter prefix filter (optional): ")
-
-                    logger.info(f"Listing objects in bucket {bucket_name}...")
-                    try:
-                        objects_result = await session.call_tool(
-                            "ListObjects",
-                            {
-                                "bucket": bucket_name,
-                                "prefix": prefix,
-                                "max_keys": 50,
-                            },
-                        )
+                        print(f"Error saving file: {e}")
+        else:
+            # Fallback for older or unexpected response formats
+            parts = getattr(result, "content", None) or [result]
+            print(f"\nContent of {object_key}:")
+            print("-----------------------------------")
+            print(head_join(getattr(part, "text", part) for part in parts))
+            print("-----------------------------------")
+
+    except Exception as e:
+        print(f"Error retrieving object: {e}")
+
+
+async def upload_object():
+    """Upload an object from text input or a file"""
+    bucket_name = await ainput("Enter bucket name: ", BUCKET_COMPLETER)
+    new_key = await ainput("Enter object key for the new file: ")
+    file_option = await ainput("Upload from (1) Text input or (2) File path? ")
+
+    if file_option == "1":
+        # Text input (existing functionality)
+        content = await ainput("Enter content for the new file: ")
+        is_base64 = False
+        content_type = "text/plain"
+    else:
+        # File upload
+        file_path = await ainput("Enter path to file: ")
+        try:
+            content = await encode_file_base64(file_path)
+            is_base64 = True
+
+            # Infer content type from extension
+            content_type = EXT_MIME.get(
+                os.path.splitext(file_path)[1].lower(),
+                "application/octet-stream",
+            )
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return
+
+    logger.info("Uploading to %s/%s...", bucket_name, new_key)
+    invalidate_list_cache(bucket_name)
+    try:
+        result = await safe_call(
+            "PutObject",
+            {
+                "bucket": bucket_name,
+                "key": new_key,
+                "content": content,
+                "content_type": content_type,
+                "is_base64": is_base64,
+            },
+        )
+        print(f"\nUpload result: {result}")
+    except Exception as e:
+        print(f"Error uploading object: {e}")
+
+
+async def delete_object():
+    """Delete an object"""
+    bucket_name = await ainput("Enter bucket name: ", BUCKET_COMPLETER)
+    key = await ainput("Enter object key to delete: ", KEY_COMPLETER)
+
+    logger.info("Deleting object %s from bucket %s...", key, bucket_name)
+    invalidate_list_cache(bucket_name)
+    try:
+        result = await safe_call("DeleteObject", {"bucket": bucket_name, "key": key})
+        print(f"\nDelete result: {result}")
+    except Exception as e:
+        print(f"Error deleting object: {e}")
+
+
+async def bulk_upload():
+    """Upload every file in a directory concurrently"""
+    bucket_name = await ainput("Enter bucket name: ", BUCKET_COMPLETER)
+    directory = await ainput("Enter directory to upload: ")
+    prefix = await ainput("Enter key prefix (optional): ")
+
+    try:
+        files = [e for e in os.scandir(directory) if e.is_file()]
+    except Exception as e:
+        print(f"Error reading directory: {e}")
+        return
+
+    def put_arguments(entry):
+        # Each file is read and encoded only when its upload starts
+        async def build():
+            return {
+                "bucket": bucket_name,
+                "key": prefix + entry.name,
+                "content": await encode_file_base64(entry.path),
+                "content_type": EXT_MIME.get(
+                    os.path.splitext(entry.name)[1].lower(),
+                    "application/octet-stream",
+                ),
+                "is_base64": True,
+            }
+
+        return build
+
+    logger.info("Uploading %s files to %s...", len(files), bucket_name)
+    invalidate_list_cache(bucket_name)
+    results = await batch_call([("PutObject", put_arguments(e)) for e in files])
+    for entry, result in zip(files, results):
+        print(f"- {prefix + entry.name}: {result}")
+
+
+async def bulk_delete():
+    """Delete several objects concurrently"""
+    bucket_name = await ainput("Enter bucket name: ", BUCKET_COMPLETER)
+    keys = await ainput("Enter object keys to delete (comma separated): ")
+
+    calls = [
+        ("DeleteObject", {"bucket": bucket_name, "key": key.strip()})
+        for key in keys.split(",")
+        if key.strip()
+    ]
+    logger.info("Deleting %s objects from %s...", len(calls), bucket_name)
+    invalidate_list_cache(bucket_name)
+    results = await batch_call(calls)
+    for (_, arguments), result in zip(calls, results):
+        print(f"- {arguments['key']}: {result}")
+
+
+# Menu choices mapped to their handlers
+HANDLERS = {
+    "0": show_tools,
+    "1": list_buckets,
+    "2": create_bucket,
+    "3": delete_bucket,
+    "4": list_objects,
+    "5": get_object,
+    "6": upload_object,
+    "7": delete_object,
+    "9": bulk_upload,
+    "10": bulk_delete,
+}
+
+# Operations menu, printed with a single call per loop iteration
+MENU = """
+=== S3 Operations Menu ===
+0. List Tools
+1. List Buckets
+2. Create Bucket
+3. Delete Bucket
+4. List Objects in Bucket
+5. Get Object
+6. Upload Object
+7. Delete Object
+8. Exit
+9. Bulk Upload
+10. Bulk Delete"""
 
-                        if (
-                            isinstance(objects_result, dict)
-                            and "objects" in objects_result
-                        ):
-                            objects = objects_result["objects"]
-                            print(f"\nObjects in bucket {bucket_name}:")
-                            for obj in objects:
-                                if isinstance(obj, dict) and "Key" in obj:
-                                    print(f"- {obj['Key']}")
-                        else:
-                            print(f"\nObjects response: {objects_result}")
-                    except Exception as e:
-                        print(f"Error listing objects: {e}")
 
-                elif choice == "5":
-                    # Get object content
-                    bucket_name = input("Enter bucket name: ")
-                    object_key = input("Enter object key: ")
-
-                    # Get the specified object
-                    logger.info(
-                        f"Retrieving object {object_key} from bucket {bucket_name}..."
-                    )
-                    try:
-                        result = await session.call_tool(
-                            "GetObject", {"bucket": bucket_name, "key": object_key}
-                        )
+async def main():
+    # Connect to the remote server via SSE
+    logger.info("Connecting to S3 MCP server at %s", SERVER_URL)
 
-                        # Handle the result based on its structure and encoding
-                        if isinstance(result, dict):
-                            # Display object metadata
-                            print(f"\nObject Information:")
-                            print(
-                                f"Content Type: {result.get('content_type', 'Unknown')}"
-                            )
-                            print(f"Size: {result.get('size_bytes', 'Unknown')} bytes")
-                            print(
-                                f"Last Modified: {result.get('last_modified', 'Unknown')}"
-                            )
-
-                            # Check encoding type to determine how to handle content
-                            encoding = result.get("encoding", "utf-8")
-
-                            if encoding == "base64":
-                                # Handle binary content (PDF, images, etc.)
-                                print(
-                                    f"\nBinary content detected ({result.get('content_type')})"
-                                )
-                                save_option = input("Save to file? (y/n): ")
-
-                                if save_option.lower() == "y":
-                                    save_path = input("Enter save path: ")
-                                    try:
-                                        binary_data = base64.b64decode(
-                                            result["content"]
-                                        )
-                                        with open(save_path, "wb") as f:
-                                            f.write(binary_data)
-                                        print(f"File saved successfully to {save_path}")
-                                    except Exception as e:
-                                        print(f"Error saving file: {e}")
-                            else:
-                                # Handle text content
-                                content = result.get("content", "")
-                                print(f"\nContent of {object_key}:")
-                                print("-----------------------------------")
-                                print(
-                                    content[:1000]
-                                    + ("..." if len(content) > 1000 else "")
-                                )
-                                print("-----------------------------------")
-
-                                # Optional: Save text content to file
-                                save_option = input("Save text to file? (y/n): ")
-                                if save_option.lower() == "y":
-                                    save_path = input("Enter save path: ")
-                                    try:
-                                        with open(
-                                            save_path, "w", encoding="utf-8"
-                                        ) as f:
-                                            f.write(content)
-                                        print(f"File saved successfully to {save_path}")
-                                    except Exception as e:
-                                        print(f"Error saving file: {e}")
-                        else:
-                            # Fallback for older or unexpected response formats
-                            print(f"\nContent of {object_key}:")
-                            print("-----------------------------------")
-                            print(
-                                str(result)[:1000]
-                                + ("..." if len(str(result)) > 1000 else "")
-                            )
-                            print("-----------------------------------")
+    await get_session()
+    logger.info("Connection initialized")
 
-                    except Exception as e:
-                        print(f"Error retrieving object: {e}")
-
-                # For uploading files
-                elif choice == "6":
-                    # Upload object
-                    bucket_name = input("Enter bucket name: ")
-                    new_key = input("Enter object key for the new file: ")
-                    file_option = input("Upload from (1) Text input or (2) File path? ")
-
-                    if file_option == "1":
-                        # Text input (existing functionality)
-                        content = input("Enter content for the new file: ")
-                        is_base64 = False
-                        content_type = "text/plain"
-                    else:
-                        # File upload
-                        file_path = input("Enter path to file: ")
-                        try:
-                            with open(file_path, "rb") as file:
-                                binary_content = file.read()
-                                content = base64.b64encode(binary_content).decode(
-                                    "ascii"
-                                )
-                                is_base64 = True
-
-                                # Infer content type from extension
-                                if file_path.lower().endswith(".pdf"):
-                                    content_type = "application/pdf"
-                                elif file_path.lower().endswith((".jpg", ".jpeg")):
-                                    content_type = "image/jpeg"
-                                elif file_path.lower().endswith(".png"):
-                                    content_type = "image/png"
-                                else:
-                                    content_type = "application/octet-stream"
-                        except Exception as e:
-                            print(f"Error reading file: {e}")
-                            continue
-
-                    logger.info(f"Uploading to {bucket_name}/{new_key}...")
-                    try:
-                        result = await session.call_tool(
-                            "PutObject",
-                            {
-                                "bucket": bucket_name,
-                                "key": new_key,
-                                "content": content,
-                                "content_type": content_type,
-                                "is_base64": is_base64,
-                            },
-                        )
-                        print(f"\nUpload result: {result}")
-                    except Exception as e:
-                        print(f"Error uploading object: {e}")
+    # Runs alongside the first prompt, so it adds no startup latency
+    prefetch = asyncio.create_task(prefetch_buckets())
 
-                elif choice == "7":
-                    # Delete object
-                    bucket_name = input("Enter bucket name: ")
-                    key = input("Enter object key to delete: ")
+    try:
+        # Main menu for operations. The tool names are known, so listing
+        # them is left to the "0" entry instead of costing a round trip here.
+        dispatch = HANDLERS.get
+        while True:
+            print(MENU)
 
-                    logger.info(f"Deleting object {key} from bucket {bucket_name}...")
-                    try:
-                        result = await session.call_tool(
-                            "DeleteObject", {"bucket": bucket_name, "key": key}
-                        )
-                        print(f"\nDelete result: {result}")
-                    except Exception as e:
-                        print(f"Error deleting object: {e}")
+            choice = await ainput("\nSelect an operation (0-10): ")
 
-                elif choice == "8":
-                    print("Exiting...")
-                    break
+            if choice == "8":
+                print("Exiting...")
+                break
 
-                else:
-                    print("Invalid choice, please try again.")
+            handler = dispatch(choice)
+            if handler is None:
+                print("Invalid choice, please try again.")
+                continue
+            await handler()
+    finally:
+        prefetch.cancel()
+        await close_session()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="S3 MCP client")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Run the tool calls listed in a JSON file instead of the menu",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print batch results and bucket and object listings as JSON",
+    )
+    args = parser.parse_args()
+    JSON_OUTPUT = args.json
+
+    if args.batch:
+        sys.exit(asyncio.run(run_batch(args.batch)))
+    else:
+        asyncio.run(main())